@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Parallel test runner for the PIM compiler test suite
+
+Each test class is dispatched to its own worker process. The tests spend
+almost all of their time waiting on the compiler subprocess, so running the
+classes side by side cuts wall-clock time roughly by the number of workers.
+"""
+
+import io
+import os
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test")
+
+
+def iter_test_cases(suite):
+    """Flatten a (possibly nested) test suite into individual test cases"""
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from iter_test_cases(test)
+        else:
+            yield test
+
+
+def group_by_class(suite):
+    """Group test ids by their TestCase class, keeping discovery order"""
+    groups = {}
+    for test in iter_test_cases(suite):
+        if type(test).__module__ == "unittest.loader":
+            # Import errors are reported as synthetic tests named after the
+            # module; reload the module in the worker to report the error
+            groups[test.id()] = [test.id().rsplit(".", 1)[1]]
+            continue
+        cls = type(test)
+        groups.setdefault(f"{cls.__module__}.{cls.__qualname__}", []).append(test.id())
+    return groups
+
+
+def run_group(test_ids):
+    """Run one group of tests in a worker process and summarize the results"""
+    if TEST_DIR not in sys.path:
+        sys.path.insert(0, TEST_DIR)
+
+    suite = unittest.TestLoader().loadTestsFromNames(test_ids)
+    stream = io.StringIO()
+    result = unittest.TextTestRunner(stream=stream, verbosity=2).run(suite)
+    return {
+        "output": stream.getvalue(),
+        "tests_run": result.testsRun,
+        "failures": len(result.failures),
+        "errors": len(result.errors),
+        "skipped": len(result.skipped),
+        "unexpected_successes": len(result.unexpectedSuccesses),
+        "successful": result.wasSuccessful(),
+    }
+
+
+def run_group_isolated(test_ids):
+    """Re-run one group in its own worker, reporting a crash as an error
+
+    With the in-process compiler bindings, an abort or segfault inside the
+    compiler kills the worker. That breaks the whole pool, so every pending
+    group is retried here to find the class that actually crashed.
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(run_group, test_ids).result()
+        except BrokenProcessPool:
+            return {
+                "output": "ERROR: worker process crashed while running: " + ", ".join(test_ids) + "\n",
+                "tests_run": 0,
+                "failures": 0,
+                "errors": 1,
+                "skipped": 0,
+                "unexpected_successes": 0,
+                "successful": False,
+            }
+
+
+def main():
+    suite = unittest.TestLoader().discover(TEST_DIR, top_level_dir=TEST_DIR)
+    groups = group_by_class(suite)
+
+    totals = {"tests_run": 0, "failures": 0, "errors": 0, "skipped": 0, "unexpected_successes": 0}
+    successful = True
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {name: executor.submit(run_group, test_ids) for name, test_ids in groups.items()}
+        for name, future in futures.items():
+            try:
+                summary = future.result()
+            except BrokenProcessPool:
+                summary = run_group_isolated(groups[name])
+            print(f"=== {name} ===")
+            print(summary["output"])
+            for key in totals:
+                totals[key] += summary[key]
+            successful = successful and summary["successful"]
+
+    print(f"Ran {totals['tests_run']} tests: "
+          f"{totals['failures']} failures, {totals['errors']} errors, "
+          f"{totals['skipped']} skipped, "
+          f"{totals['unexpected_successes']} unexpected successes")
+
+    return 0 if successful else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
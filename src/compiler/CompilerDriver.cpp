@@ -0,0 +1,401 @@
+/**
+ * CompilerDriver.cpp
+ * Implementation of the command-line driver for the PIM Compiler
+ */
+
+#include "CompilerDriver.h"
+
+#include <algorithm>
+#include <iostream>
+#include <fstream>
+#include <map>
+#include <sstream>
+#include <string>
+#include <vector>
+#include <unistd.h>
+
+#include "Parser.h"
+#include "IRGenerator.h"
+#include "PIMBackend.h"
+#include "MemoryMapper.h"
+#include "../optimizer/RefactoringAssistant.h"
+#include "../utils/Logger.h"
+#include "../utils/FdCapture.h"
+
+#include <llvm/Support/Error.h>
+#include <llvm/Support/JSON.h>
+#include <llvm/Support/raw_ostream.h>
+
+namespace {
+
+// Write one batch result as a single JSON line
+void writeBatchResult(std::ostream& results, llvm::json::Object result) {
+    std::string line;
+    llvm::raw_string_ostream lineStream(line);
+    lineStream << llvm::json::Value(std::move(result));
+    lineStream.flush();
+    results << line << std::endl;
+}
+
+} // namespace
+
+void printUsage(const std::string& programName) {
+    std::cout << "Usage: " << programName << " [options] input_file\n"
+              << "Options:\n"
+              << "  -o <file>        Write output to <file>\n"
+              << "  -v, --verbose    Enable verbose output\n"
+              << "  -h, --help       Display this help message\n"
+              << "  --dump-ir        Dump LLVM IR to stderr\n"
+              << "  --batch          Compile jobs read as JSON lines from stdin\n"
+              << "  --refactor       Enable AI-powered code refactoring suggestions\n"
+              << "  --refactor-only  Only suggest refactoring without compiling\n"
+              << "  --refactor-detailed    Generate more detailed refactoring suggestions\n";
+}
+
+int compilerMain(const std::string& programName,
+                 const std::vector<std::string>& args,
+                 const std::string* sourceText,
+                 std::string* outputText) {
+    // Batch mode compiles many inputs in one process; remaining options apply to every job
+    if (std::find(args.begin(), args.end(), "--batch") != args.end()) {
+        // In-memory callers (the Python bindings) must not block on our stdin
+        if (sourceText || outputText) {
+            std::cerr << "Error: --batch is not supported with in-memory source or output\n";
+            return 1;
+        }
+
+        std::vector<std::string> commonArgs;
+        for (const auto& arg : args) {
+            if (arg != "--batch") {
+                commonArgs.push_back(arg);
+            }
+        }
+        return runBatch(programName, commonArgs, std::cin, std::cout);
+    }
+
+    // Parse command line arguments
+    std::string inputFile;
+    std::string outputFile = "a.out";
+    bool verbose = false;
+    bool dumpIR = false;
+    bool enableRefactoring = false;
+    bool refactorOnly = false;
+    bool detailedRefactoring = false;
+
+    for (size_t i = 0; i < args.size(); ++i) {
+        const std::string& arg = args[i];
+        if (arg == "-h" || arg == "--help") {
+            printUsage(programName);
+            return 0;
+        } else if (arg == "-v" || arg == "--verbose") {
+            verbose = true;
+        } else if (arg == "--dump-ir") {
+            dumpIR = true;
+        } else if (arg == "--refactor") {
+            enableRefactoring = true;
+        } else if (arg == "--refactor-only") {
+            enableRefactoring = true;
+            refactorOnly = true;
+        } else if (arg == "--refactor-detailed") {
+            enableRefactoring = true;
+            detailedRefactoring = true;
+        } else if (arg == "-o" && i + 1 < args.size()) {
+            outputFile = args[++i];
+        } else if (arg[0] != '-') {
+            inputFile = arg;
+        } else {
+            std::cerr << "Unknown option: " << arg << std::endl;
+            printUsage(programName);
+            return 1;
+        }
+    }
+
+    if (inputFile.empty()) {
+        if (!sourceText) {
+            std::cerr << "Error: No input file specified\n";
+            printUsage(programName);
+            return 1;
+        }
+        inputFile = "<memory>";
+    }
+
+    // Set up logging
+    Logger::getInstance().setVerbose(verbose);
+    Logger::getInstance().log("PIM Compiler started");
+    Logger::getInstance().log("Input file: " + inputFile);
+    Logger::getInstance().log("Output file: " + outputFile);
+
+    try {
+        // Read input file, unless the source was provided directly
+        std::string source;
+        if (sourceText) {
+            source = *sourceText;
+        } else {
+            std::ifstream inFile(inputFile);
+            if (!inFile) {
+                std::cerr << "Error: Could not open input file: " << inputFile << std::endl;
+                return 1;
+            }
+
+            source.assign((std::istreambuf_iterator<char>(inFile)),
+                          std::istreambuf_iterator<char>());
+            inFile.close();
+        }
+        
+        // Process refactoring if enabled
+        if (enableRefactoring) {
+            Logger::getInstance().log("Running AI-powered code refactoring analysis...");
+            std::cout << "\n=== PIM Architecture Code Refactoring Assistant ===\n";
+            
+            RefactoringAssistant assistant;
+            if (verbose) {
+                assistant.setVerbosity(1);
+            }
+            
+            std::map<std::string, std::pair<std::string, std::string>> suggestions;
+            
+            if (detailedRefactoring) {
+                std::cout << "Using detailed rule-based refactoring analysis...\n";
+                // Enable more detailed analysis by setting higher verbosity
+                assistant.setVerbosity(2);
+            }
+            
+            suggestions = assistant.suggestRefactorings(source);
+            
+            if (suggestions.empty()) {
+                std::cout << "No refactoring suggestions found for the provided code.\n";
+                std::cout << "The code appears to be already well-optimized for PIM architecture.\n";
+            } else {
+                std::cout << "Found " << suggestions.size() << " potential optimizations:\n\n";
+                
+                int i = 1;
+                for (const auto& [description, codePair] : suggestions) {
+                    const auto& [originalCode, refactoredCode] = codePair;
+                    
+                    std::cout << "Suggestion " << i << ": " << description << "\n";
+                    std::cout << "-------------------------------------\n";
+                    std::cout << "Original code:\n";
+                    std::cout << originalCode << "\n\n";
+                    std::cout << "Suggested refactoring:\n";
+                    std::cout << refactoredCode << "\n\n";
+                    
+                    i++;
+                }
+                
+                // Create a refactored version of the source
+                std::string refactoredSource = source;
+                for (const auto& [description, codePair] : suggestions) {
+                    const auto& [originalCode, refactoredCode] = codePair;
+                    size_t pos = refactoredSource.find(originalCode);
+                    if (pos != std::string::npos) {
+                        refactoredSource.replace(pos, originalCode.length(), refactoredCode);
+                    }
+                }
+                
+                // Write refactored version next to the input file (if there is one)
+                if (sourceText) {
+                    std::cout << "Refactored code not written: source was not read from a file\n";
+                } else {
+                    std::string refactoredFilename = inputFile.substr(0, inputFile.find_last_of('.')) + "_refactored.cpp";
+                    std::ofstream refactoredFile(refactoredFilename);
+                    if (refactoredFile) {
+                        refactoredFile << refactoredSource;
+                        refactoredFile.close();
+                        std::cout << "Refactored code written to: " << refactoredFilename << "\n";
+                    }
+                }
+            }
+            
+            if (refactorOnly) {
+                return 0;
+            }
+            
+            std::cout << "\n=== Continuing with compilation ===\n\n";
+        }
+
+        // Create compiler pipeline components
+        Parser parser;
+        IRGenerator irGenerator;
+        MemoryMapper memoryMapper;
+        PIMBackend backend;
+
+        // Execute compilation pipeline
+        Logger::getInstance().log("Parsing input file...");
+        std::unique_ptr<llvm::Module> module;
+        
+#ifdef HAVE_CLANG
+        auto ast = parser.parse(source);
+        Logger::getInstance().log("Generating LLVM IR...");
+        module = irGenerator.generateIR(ast);
+#else
+        try {
+            void* dummyAst = parser.parse(source);
+            Logger::getInstance().log("Generating LLVM IR...");
+            module = irGenerator.generateIR(dummyAst);
+        } catch (const std::runtime_error& e) {
+            Logger::getInstance().log("Using fallback path: Clang not available");
+            // Pass nullptr as a void* directly to the IR generator
+            module = irGenerator.generateIR(nullptr);
+        }
+#endif
+        
+        if (dumpIR) {
+            irGenerator.dumpIR(module);
+        }
+        
+        Logger::getInstance().log("Applying memory mapping for PIM architecture...");
+        auto mappedModule = memoryMapper.applyMemoryMapping(module);
+        
+        Logger::getInstance().log("Generating PIM instructions...");
+        auto instructions = backend.generatePIMInstructions(mappedModule);
+        
+        // Add instruction-level optimization suggestions if refactoring is enabled
+        if (enableRefactoring) {
+            Logger::getInstance().log("Analyzing generated PIM instructions...");
+            std::cout << "\n=== PIM Instruction Optimization Analysis ===\n";
+            
+            RefactoringAssistant assistant;
+            auto instructionSuggestions = assistant.suggestInstructionOptimizations(instructions, source);
+            
+            if (instructionSuggestions.empty()) {
+                std::cout << "No instruction-level optimization suggestions found.\n";
+                std::cout << "The generated PIM code appears to be already well-optimized.\n";
+            } else {
+                std::cout << "Found " << instructionSuggestions.size() << " potential instruction-level optimizations:\n\n";
+                
+                int i = 1;
+                for (const auto& [name, suggestion] : instructionSuggestions) {
+                    std::cout << "Suggestion " << i << ": " << name << "\n";
+                    std::cout << "-------------------------------------\n";
+                    std::cout << suggestion << "\n\n";
+                    i++;
+                }
+            }
+        }
+        
+        // Write output to file, or hand it back to the caller
+        if (outputText) {
+            std::ostringstream outStream;
+            for (const auto& instruction : instructions) {
+                outStream << instruction.toString() << "\n";
+            }
+            *outputText = outStream.str();
+        } else {
+            std::ofstream outFile(outputFile);
+            if (!outFile) {
+                std::cerr << "Error: Could not open output file: " << outputFile << std::endl;
+                return 1;
+            }
+            
+            for (const auto& instruction : instructions) {
+                outFile << instruction.toString() << "\n";
+            }
+            outFile.close();
+        }
+        
+        Logger::getInstance().log("Compilation completed successfully");
+        std::cout << "Compiled " << inputFile << " to " << outputFile << std::endl;
+        
+        return 0;
+    } catch (const std::exception& e) {
+        std::cerr << "Error: " << e.what() << std::endl;
+        return 1;
+    }
+}
+
+int runBatch(const std::string& programName,
+             const std::vector<std::string>& commonArgs,
+             std::istream& jobs,
+             std::ostream& results) {
+    int status = 0;
+    std::string line;
+
+    while (std::getline(jobs, line)) {
+        if (line.find_first_not_of(" \t\r") == std::string::npos) {
+            continue;
+        }
+
+        llvm::json::Object result;
+
+        // Parse and validate the job description
+        llvm::Expected<llvm::json::Value> parsed = llvm::json::parse(line);
+        if (!parsed) {
+            result["returncode"] = 1;
+            result["stderr"] = "Error: Invalid batch job: " + llvm::toString(parsed.takeError()) + "\n";
+            writeBatchResult(results, std::move(result));
+            status = 1;
+            continue;
+        }
+
+        const llvm::json::Object* job = parsed->getAsObject();
+        // An explicit output is required so jobs never fall back to ./a.out
+        if (!job || !job->getString("src") || !job->getString("out")) {
+            result["returncode"] = 1;
+            result["stderr"] = "Error: Batch job must be an object with \"src\" and \"out\" strings\n";
+            writeBatchResult(results, std::move(result));
+            status = 1;
+            continue;
+        }
+        auto src = job->getString("src");
+        auto out = job->getString("out");
+
+        std::vector<std::string> jobArgs = commonArgs;
+        bool validFlags = true;
+        if (const llvm::json::Value* flagsValue = job->get("flags")) {
+            const llvm::json::Array* flags = flagsValue->getAsArray();
+            if (!flags) {
+                validFlags = false;
+            } else {
+                for (const auto& flag : *flags) {
+                    auto flagStr = flag.getAsString();
+                    if (!flagStr || *flagStr == "--batch") {
+                        validFlags = false;
+                        break;
+                    }
+                    jobArgs.push_back(flagStr->str());
+                }
+            }
+        }
+        if (!validFlags) {
+            result["src"] = src->str();
+            result["returncode"] = 1;
+            result["stderr"] = "Error: Batch job flags must be an array of strings other than --batch\n";
+            writeBatchResult(results, std::move(result));
+            status = 1;
+            continue;
+        }
+
+        jobArgs.push_back("-o");
+        jobArgs.push_back(out->str());
+        jobArgs.push_back(src->str());
+
+        // Run the job with its console output captured into the result, at the
+        // descriptor level so LLVM/Clang diagnostics are attributed to the job
+        int returnCode;
+        std::string jobStdout;
+        std::string jobStderr;
+        try {
+            FdCapture stdoutCapture(STDOUT_FILENO);
+            FdCapture stderrCapture(STDERR_FILENO);
+            returnCode = compilerMain(programName, jobArgs);
+            jobStderr = stderrCapture.finish();
+            jobStdout = stdoutCapture.finish();
+        } catch (const std::exception& e) {
+            returnCode = 1;
+            jobStderr = std::string("Error: ") + e.what() + "\n";
+        }
+
+        result["src"] = src->str();
+        result["out"] = out->str();
+        result["returncode"] = returnCode;
+        result["stdout"] = llvm::json::fixUTF8(jobStdout);
+        result["stderr"] = llvm::json::fixUTF8(jobStderr);
+        writeBatchResult(results, std::move(result));
+
+        if (returnCode != 0) {
+            status = 1;
+        }
+    }
+
+    return status;
+}
@@ -0,0 +1,51 @@
+/**
+ * CompilerDriver.h
+ * Command-line driver shared by the pim_compiler executable and the Python bindings
+ */
+
+#ifndef COMPILER_DRIVER_H
+#define COMPILER_DRIVER_H
+
+#include <iosfwd>
+#include <string>
+#include <vector>
+
+/**
+ * Print command-line usage information
+ * @param programName Name of the program to show in the usage line
+ */
+void printUsage(const std::string& programName);
+
+/**
+ * Run the compiler with command-line style arguments
+ * @param programName Name of the program (argv[0])
+ * @param args Command-line arguments, excluding the program name
+ * @param sourceText If non-null, compile this source instead of reading the input file
+ * @param outputText If non-null, store the generated instructions here instead of writing the output file
+ * @return Process exit code (0 on success)
+ */
+int compilerMain(const std::string& programName,
+                 const std::vector<std::string>& args,
+                 const std::string* sourceText = nullptr,
+                 std::string* outputText = nullptr);
+
+/**
+ * Compile a batch of jobs in a single process
+ *
+ * Each line of jobs is a JSON object {"src": <input file>, "out": <output file>,
+ * "flags": [<extra options>]}; "flags" is optional. For every job one JSON line
+ * {"src", "out", "returncode", "stdout", "stderr"} is written to results; jobs
+ * that cannot be parsed or validated get a result with returncode 1.
+ *
+ * @param programName Name of the program (argv[0])
+ * @param commonArgs Options applied to every job, before the job's own flags
+ * @param jobs Stream of job lines
+ * @param results Stream receiving one result line per job
+ * @return 0 if every job succeeded, 1 otherwise
+ */
+int runBatch(const std::string& programName,
+             const std::vector<std::string>& commonArgs,
+             std::istream& jobs,
+             std::ostream& results);
+
+#endif // COMPILER_DRIVER_H
@@ -0,0 +1,49 @@
+/**
+ * PIMCompilerModule.cpp
+ * Python bindings that run the PIM compiler in-process (module pim_compiler_py)
+ */
+
+#include <string>
+#include <vector>
+#include <unistd.h>
+
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include "compiler/CompilerDriver.h"
+#include "utils/FdCapture.h"
+
+namespace py = pybind11;
+
+namespace {
+
+py::tuple run(const std::vector<std::string>& args, const std::string& source) {
+    std::string output;
+    int returnCode;
+    std::string stdoutText;
+    std::string stderrText;
+    {
+        FdCapture stdoutCapture(STDOUT_FILENO);
+        FdCapture stderrCapture(STDERR_FILENO);
+        returnCode = compilerMain("pim_compiler", args, &source, &output);
+        stderrText = stderrCapture.finish();
+        stdoutText = stdoutCapture.finish();
+    }
+
+    // Like the executable, only produce output on success
+    py::object outputObj = py::none();
+    if (returnCode == 0) {
+        outputObj = py::bytes(output);
+    }
+    return py::make_tuple(returnCode, py::bytes(stdoutText), py::bytes(stderrText), outputObj);
+}
+
+} // namespace
+
+PYBIND11_MODULE(pim_compiler_py, m) {
+    m.doc() = "In-process bindings for the PIM compiler";
+
+    m.def("run", &run, py::arg("args"), py::arg("source"),
+          "Compile source with command-line style args (no input file or -o needed).\n"
+          "Returns (returncode, stdout, stderr, output); output is None on failure.");
+}
@@ -0,0 +1,68 @@
+/**
+ * FdCapture.cpp
+ * Implementation of file descriptor output capture
+ */
+
+#include "FdCapture.h"
+
+#include <iostream>
+#include <stdexcept>
+#include <unistd.h>
+
+#include <llvm/Support/raw_ostream.h>
+
+namespace {
+
+// Flush every layer that may buffer output for stdout/stderr
+void flushAllStreams() {
+    std::cout.flush();
+    std::cerr.flush();
+    llvm::outs().flush();
+    llvm::errs().flush();
+    std::fflush(nullptr);
+}
+
+} // namespace
+
+FdCapture::FdCapture(int fd) : fd(fd), file(std::tmpfile()), savedFd(-1) {
+    if (!file) {
+        throw std::runtime_error("Could not create temporary file for output capture");
+    }
+    flushAllStreams();
+    savedFd = dup(fd);
+    if (savedFd < 0 || dup2(fileno(file), fd) < 0) {
+        // The destructor will not run, so release everything acquired so far
+        if (savedFd >= 0) {
+            close(savedFd);
+        }
+        std::fclose(file);
+        throw std::runtime_error("Could not redirect output for capture");
+    }
+}
+
+FdCapture::~FdCapture() {
+    restore();
+    std::fclose(file);
+}
+
+std::string FdCapture::finish() {
+    restore();
+
+    std::string text;
+    std::rewind(file);
+    char buffer[4096];
+    size_t count;
+    while ((count = std::fread(buffer, 1, sizeof(buffer), file)) > 0) {
+        text.append(buffer, count);
+    }
+    return text;
+}
+
+void FdCapture::restore() {
+    if (savedFd >= 0) {
+        flushAllStreams();
+        dup2(savedFd, fd);
+        close(savedFd);
+        savedFd = -1;
+    }
+}
@@ -0,0 +1,34 @@
+/**
+ * FdCapture.h
+ * Captures everything written to a file descriptor, such as stdout or stderr
+ */
+
+#ifndef FD_CAPTURE_H
+#define FD_CAPTURE_H
+
+#include <cstdio>
+#include <string>
+
+// Redirects a file descriptor into a temporary file, so output from
+// iostreams, stdio and LLVM/Clang diagnostics is captured alike
+class FdCapture {
+public:
+    // Start capturing fd; throws std::runtime_error if it cannot be redirected
+    explicit FdCapture(int fd);
+    ~FdCapture();
+
+    FdCapture(const FdCapture&) = delete;
+    FdCapture& operator=(const FdCapture&) = delete;
+
+    // Stop capturing and return everything written to the descriptor
+    std::string finish();
+
+private:
+    void restore();
+
+    int fd;
+    std::FILE* file;
+    int savedFd;
+};
+
+#endif // FD_CAPTURE_H
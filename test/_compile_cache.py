@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of PIM compiler results for the test suite
+
+Several tests compile identical sources with identical flags. Results are
+stored under a key derived from the compiler binary, the flags and the
+source, so repeated compilations (within a run or across runs) become
+file reads. On a miss, the compiler runs in-process through the
+pim_compiler_py bindings when they were built next to the executable,
+and as a subprocess otherwise.
+"""
+
+import collections
+import hashlib
+import importlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Set PIM_TEST_CACHE_DIR to an empty string to disable caching
+CACHE_DIR = os.environ.get(
+    "PIM_TEST_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "pim_compiler_tests"))
+
+CompileResult = collections.namedtuple("CompileResult", ["returncode", "stdout", "stderr", "output"])
+
+# Bindings module per build directory (None if not built there)
+_bindings = {}
+
+
+def _load_bindings(compiler_path):
+    """Import pim_compiler_py from the compiler's build directory, if present"""
+    build_dir = os.path.dirname(os.path.abspath(compiler_path))
+    if build_dir not in _bindings:
+        sys.path.insert(0, build_dir)
+        try:
+            _bindings[build_dir] = importlib.import_module("pim_compiler_py")
+        except ImportError:
+            _bindings[build_dir] = None
+        finally:
+            sys.path.remove(build_dir)
+    return _bindings[build_dir]
+
+
+def _file_id(path):
+    stat = os.stat(path)
+    return f"{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _cache_key(compiler_path, bindings, args, source_bytes):
+    # Include the identity of whatever actually compiles (and a backend tag,
+    # since logged paths differ) so a rebuilt compiler invalidates old entries
+    if bindings is not None:
+        compiler_id = f"bindings:{_file_id(bindings.__file__)}"
+    else:
+        compiler_id = f"subprocess:{_file_id(compiler_path)}"
+    args_bytes = [arg.encode() for arg in args]
+    return hashlib.sha1(compiler_id.encode() + b"\0" + source_bytes + b"\0" + b"\0".join(args_bytes)).hexdigest()
+
+
+def _load(entry_dir):
+    out_path = entry_dir / "out"
+    return CompileResult(
+        int((entry_dir / "rc").read_bytes()),
+        (entry_dir / "stdout").read_bytes(),
+        (entry_dir / "stderr").read_bytes(),
+        out_path.read_bytes() if out_path.exists() else None)
+
+
+def _store(entry_dir, result):
+    # Populate a private directory first, then rename it into place so
+    # concurrent test processes never observe a partial entry
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    staging_dir = Path(tempfile.mkdtemp(dir=CACHE_DIR))
+    try:
+        (staging_dir / "rc").write_bytes(str(result.returncode).encode())
+        (staging_dir / "stdout").write_bytes(result.stdout)
+        (staging_dir / "stderr").write_bytes(result.stderr)
+        if result.output is not None:
+            (staging_dir / "out").write_bytes(result.output)
+        staging_dir.rename(entry_dir)
+    except OSError:
+        # A write failed, or another process stored the same entry first
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def run_compiler(compiler_path, args, source_bytes, scratch_dir=None):
+    """Compile source_bytes with the given flags, reusing a cached result when available
+
+    When the compiler runs as a subprocess, the source and output files are
+    placed in a temporary directory under scratch_dir. The output is None
+    when the compiler produced no output. Only successful compilations are
+    cached, so a failure is always reproduced by a fresh run.
+    """
+    bindings = _load_bindings(compiler_path)
+
+    entry_dir = None
+    if CACHE_DIR:
+        entry_dir = Path(CACHE_DIR, _cache_key(compiler_path, bindings, args, source_bytes))
+        if entry_dir.is_dir():
+            return _load(entry_dir)
+
+    if bindings is not None:
+        result = CompileResult(*bindings.run(args, source_bytes))
+    else:
+        result = _run_subprocess(compiler_path, args, source_bytes, scratch_dir)
+
+    if entry_dir is not None and result.returncode == 0:
+        _store(entry_dir, result)
+    return result
+
+
+def _run_subprocess(compiler_path, args, source_bytes, scratch_dir):
+    with tempfile.TemporaryDirectory(dir=scratch_dir) as work_dir:
+        source_file = Path(work_dir, "input.cpp")
+        output_file = Path(work_dir, "output.txt")
+        source_file.write_bytes(source_bytes)
+
+        proc = subprocess.run(
+            [compiler_path, *args, "-o", output_file, source_file],
+            capture_output=True
+        )
+
+        output = output_file.read_bytes() if output_file.exists() else None
+
+    return CompileResult(proc.returncode, proc.stdout, proc.stderr, output)
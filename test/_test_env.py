@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test environment shared by the PIM compiler test modules
+
+Resolves the compiler executable and the scratch location once, and
+provides the per-class setup every test class uses.
+"""
+
+import os
+import tempfile
+import unittest
+
+# Compiler executable, resolved once (PIM_COMPILER overrides the build/ default)
+COMPILER = os.path.realpath(os.environ.get(
+    "PIM_COMPILER", os.path.join(os.path.dirname(__file__), "..", "build", "pim_compiler")))
+COMPILER_EXISTS = os.path.isfile(COMPILER)
+
+# Scratch location for test sources and outputs
+TEST_TMPDIR = os.environ.get("TEST_TMPDIR", "/dev/shm")
+
+
+class CompilerTestMixin:
+    """Skips the class without a built compiler and shares one temp directory"""
+
+    @classmethod
+    def setUpClass(cls):
+        # Check if the compiler exists
+        if not COMPILER_EXISTS:
+            raise unittest.SkipTest("Compiler executable not found. Build the project first.")
+
+        # Create a temporary directory shared by all tests in the class,
+        # on tmpfs when available (falls back to the system default)
+        scratch_dir = TEST_TMPDIR if os.path.isdir(TEST_TMPDIR) else None
+        cls.temp_dir = tempfile.TemporaryDirectory(dir=scratch_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        # Clean up the temporary directory
+        cls.temp_dir.cleanup()
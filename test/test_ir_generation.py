@@ -3,37 +3,28 @@
 Test script for the IR Generation component of the PIM compiler
 """
 
-import os
+import re
 import sys
-import subprocess
-import tempfile
 import unittest
 
-class IRGenerationTest(unittest.TestCase):
+from _compile_cache import run_compiler
+from _test_env import COMPILER, CompilerTestMixin
+
+class IRGenerationTest(CompilerTestMixin, unittest.TestCase):
     
-    def setUp(self):
-        # Path to the compiler executable
-        self.compiler_path = os.path.join("..", "build", "pim_compiler")
-        
-        # Check if the compiler exists
-        if not os.path.exists(self.compiler_path):
-            self.skipTest("Compiler executable not found. Build the project first.")
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
         
-        # Create a temporary directory for test files
-        self.temp_dir = tempfile.TemporaryDirectory()
-    
-    def tearDown(self):
-        # Clean up the temporary directory
-        self.temp_dir.cleanup()
+        # Compile all test functions in a single compiler invocation
+        cls._compile_once()
     
-    def test_ir_generation_basic(self):
-        """Test LLVM IR generation for a basic matrix multiplication"""
-        
-        # Create a test C++ file
-        test_file = os.path.join(self.temp_dir.name, "test_ir_basic.cpp")
-        with open(test_file, "w") as f:
-            f.write("""
-            void matrixMultiply(int A[][10], int B[][10], int C[][10], int m, int n, int p) {
+    @classmethod
+    def _compile_once(cls):
+        # Every test function lives in one translation unit, so compiler
+        # startup is paid once and each test inspects its own IR function
+        source = b"""
+            void matrixMultiply_basic(int A[][10], int B[][10], int C[][10], int m, int n, int p) {
                 for (int i = 0; i < m; i++) {
                     for (int j = 0; j < p; j++) {
                         C[i][j] = 0;
@@ -43,37 +34,8 @@ class IRGenerationTest(unittest.TestCase):
                     }
                 }
             }
-            """)
-        
-        # Run the compiler with --dump-ir to check IR generation
-        output_file = os.path.join(self.temp_dir.name, "output.txt")
-        result = subprocess.run(
-            [self.compiler_path, "--dump-ir", "-v", "-o", output_file, test_file],
-            capture_output=True,
-            text=True
-        )
-        
-        # Check if IR generation was successful
-        self.assertEqual(result.returncode, 0, 
-                         f"IR generation test failed with return code {result.returncode}. Error: {result.stderr}")
-        
-        # Check for expected IR elements in the output
-        self.assertIn("define", result.stderr)
-        self.assertIn("matrixMultiply", result.stderr)
-        self.assertIn("alloca", result.stderr)
-        self.assertIn("store", result.stderr)
-        self.assertIn("load", result.stderr)
-        self.assertIn("mul", result.stderr)
-        self.assertIn("add", result.stderr)
-    
-    def test_ir_generation_parameterized(self):
-        """Test LLVM IR generation for parameterized matrix multiplication"""
-        
-        # Create a test C++ file with parameterized dimensions
-        test_file = os.path.join(self.temp_dir.name, "test_ir_param.cpp")
-        with open(test_file, "w") as f:
-            f.write("""
-            void matrixMultiply(int* A, int* B, int* C, int rows, int cols, int common) {
+            
+            void matrixMultiply_param(int* A, int* B, int* C, int rows, int cols, int common) {
                 for (int i = 0; i < rows; i++) {
                     for (int j = 0; j < cols; j++) {
                         C[i * cols + j] = 0;
@@ -83,33 +45,8 @@ class IRGenerationTest(unittest.TestCase):
                     }
                 }
             }
-            """)
-        
-        # Run the compiler with --dump-ir to check IR generation
-        output_file = os.path.join(self.temp_dir.name, "output.txt")
-        result = subprocess.run(
-            [self.compiler_path, "--dump-ir", "-v", "-o", output_file, test_file],
-            capture_output=True,
-            text=True
-        )
-        
-        # Check if IR generation was successful
-        self.assertEqual(result.returncode, 0, 
-                         f"IR generation test failed with return code {result.returncode}. Error: {result.stderr}")
-        
-        # Check for expected IR elements in the output
-        self.assertIn("define", result.stderr)
-        self.assertIn("matrixMultiply", result.stderr)
-        self.assertIn("getelementptr", result.stderr)
-    
-    def test_ir_generation_complex_expressions(self):
-        """Test LLVM IR generation for complex array indexing expressions"""
-        
-        # Create a test C++ file with complex indexing
-        test_file = os.path.join(self.temp_dir.name, "test_ir_complex.cpp")
-        with open(test_file, "w") as f:
-            f.write("""
-            void matrixMultiply(int* A, int* B, int* C, int rows, int cols, int common) {
+            
+            void matrixMultiply_complex(int* A, int* B, int* C, int rows, int cols, int common) {
                 for (int i = 0; i < rows; i++) {
                     for (int j = 0; j < cols; j++) {
                         C[i * cols + j] = 0;
@@ -125,25 +62,61 @@ class IRGenerationTest(unittest.TestCase):
                     }
                 }
             }
-            """)
+            """
         
         # Run the compiler with --dump-ir to check IR generation
-        output_file = os.path.join(self.temp_dir.name, "output.txt")
-        result = subprocess.run(
-            [self.compiler_path, "--dump-ir", "-v", "-o", output_file, test_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_compiler(COMPILER, ["--dump-ir"], source, cls.temp_dir.name)
+        cls.returncode = result.returncode
+        cls.cached_stdout = result.stdout
+        cls.cached_stderr = result.stderr
+    
+    def _function_ir(self, name):
+        """Return the IR dumped for a single function"""
         
         # Check if IR generation was successful
-        self.assertEqual(result.returncode, 0, 
-                         f"IR generation test failed with return code {result.returncode}. Error: {result.stderr}")
+        if self.returncode != 0:
+            err = self.cached_stderr.decode("utf-8", "replace")
+            self.fail(f"IR generation test failed with return code {self.returncode}. Error: {err}")
+        
+        match = re.search(rb"^define [^\n]*@" + name.encode() + rb"\(.*?^}", self.cached_stderr,
+                          re.MULTILINE | re.DOTALL)
+        if match is not None:
+            return match.group(0)
+        
+        # Builds without Clang ignore the source and emit only a hardcoded
+        # @matrixMultiply; check against the whole dump in that case
+        self.assertRegex(self.cached_stderr, rb"(?m)^define [^\n]*@matrixMultiply\(",
+                         f"No IR generated for function {name}")
+        return self.cached_stderr
+    
+    def test_ir_generation_basic(self):
+        """Test LLVM IR generation for a basic matrix multiplication"""
+        
+        ir = self._function_ir("matrixMultiply_basic")
+        
+        # Check for expected IR elements in the output
+        self.assertIn(b"alloca", ir)
+        self.assertIn(b"store", ir)
+        self.assertIn(b"load", ir)
+        self.assertIn(b"mul", ir)
+        self.assertIn(b"add", ir)
+    
+    def test_ir_generation_parameterized(self):
+        """Test LLVM IR generation for parameterized matrix multiplication"""
+        
+        ir = self._function_ir("matrixMultiply_param")
+        
+        # Check for expected IR elements in the output
+        self.assertIn(b"getelementptr", ir)
+    
+    def test_ir_generation_complex_expressions(self):
+        """Test LLVM IR generation for complex array indexing expressions"""
+        
+        ir = self._function_ir("matrixMultiply_complex")
         
         # Check for expected IR elements in the output
-        self.assertIn("define", result.stderr)
-        self.assertIn("matrixMultiply", result.stderr)
-        self.assertIn("mul", result.stderr)
-        self.assertIn("sdiv", result.stderr)  # For division
+        self.assertIn(b"mul", ir)
+        self.assertIn(b"sdiv", ir)  # For division
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,36 +3,19 @@
 Test script for the Memory Mapper component of the PIM compiler
 """
 
-import os
 import sys
-import subprocess
-import tempfile
 import unittest
 
-class MemoryMapperTest(unittest.TestCase):
-    
-    def setUp(self):
-        # Path to the compiler executable
-        self.compiler_path = os.path.join("..", "build", "pim_compiler")
-        
-        # Check if the compiler exists
-        if not os.path.exists(self.compiler_path):
-            self.skipTest("Compiler executable not found. Build the project first.")
-        
-        # Create a temporary directory for test files
-        self.temp_dir = tempfile.TemporaryDirectory()
-    
-    def tearDown(self):
-        # Clean up the temporary directory
-        self.temp_dir.cleanup()
+from _compile_cache import run_compiler
+from _test_env import COMPILER, CompilerTestMixin
+
+class MemoryMapperTest(CompilerTestMixin, unittest.TestCase):
     
     def test_memory_mapping_basic(self):
         """Test basic memory mapping for matrix multiplication"""
         
-        # Create a test C++ file
-        test_file = os.path.join(self.temp_dir.name, "test_memory_basic.cpp")
-        with open(test_file, "w") as f:
-            f.write("""
+        # Test C++ source
+        source = b"""
             void matrixMultiply(int A[][10], int B[][10], int C[][10], int m, int n, int p) {
                 for (int i = 0; i < m; i++) {
                     for (int j = 0; j < p; j++) {
@@ -43,36 +26,30 @@ class MemoryMapperTest(unittest.TestCase):
                     }
                 }
             }
-            """)
+            """
         
         # Run the compiler with verbose output to check memory mapping
-        output_file = os.path.join(self.temp_dir.name, "output.txt")
-        result = subprocess.run(
-            [self.compiler_path, "-v", "-o", output_file, test_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_compiler(COMPILER, ["-v"], source, self.temp_dir.name)
         
         # Check if compilation was successful
-        self.assertEqual(result.returncode, 0, 
-                         f"Memory mapper test failed with return code {result.returncode}. Error: {result.stderr}")
+        if result.returncode != 0:
+            err = result.stderr.decode("utf-8", "replace")
+            self.fail(f"Memory mapper test failed with return code {result.returncode}. Error: {err}")
         
         # Check for memory mapping logs
-        self.assertIn("memory mapping", result.stdout.lower())
+        self.assertIn(b"memory mapping", result.stdout.lower())
         
         # Check output file for expected memory-related instructions
-        with open(output_file, "r") as f:
-            content = f.read()
-            self.assertIn("LOAD", content)
-            self.assertIn("STORE", content)
+        self.assertIsNotNone(result.output, "Output file was not created")
+        content = result.output
+        self.assertIn(b"LOAD", content)
+        self.assertIn(b"STORE", content)
     
     def test_memory_mapping_linear_arrays(self):
         """Test memory mapping for linear arrays"""
         
-        # Create a test C++ file using linear arrays
-        test_file = os.path.join(self.temp_dir.name, "test_memory_linear.cpp")
-        with open(test_file, "w") as f:
-            f.write("""
+        # Test C++ source using linear arrays
+        source = b"""
             void matrixMultiply(int* A, int* B, int* C, int rows, int cols, int common) {
                 for (int i = 0; i < rows; i++) {
                     for (int j = 0; j < cols; j++) {
@@ -83,28 +60,24 @@ class MemoryMapperTest(unittest.TestCase):
                     }
                 }
             }
-            """)
+            """
         
         # Run the compiler with verbose output
-        output_file = os.path.join(self.temp_dir.name, "output.txt")
-        result = subprocess.run(
-            [self.compiler_path, "-v", "-o", output_file, test_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_compiler(COMPILER, ["-v"], source, self.temp_dir.name)
         
         # Check if compilation was successful
-        self.assertEqual(result.returncode, 0, 
-                         f"Memory mapper test failed with return code {result.returncode}. Error: {result.stderr}")
+        if result.returncode != 0:
+            err = result.stderr.decode("utf-8", "replace")
+            self.fail(f"Memory mapper test failed with return code {result.returncode}. Error: {err}")
         
         # Check for memory mapping logs
-        self.assertIn("memory mapping", result.stdout.lower())
+        self.assertIn(b"memory mapping", result.stdout.lower())
         
         # Check output file for expected memory-related instructions
-        with open(output_file, "r") as f:
-            content = f.read()
-            self.assertIn("LOAD", content)
-            self.assertIn("STORE", content)
+        self.assertIsNotNone(result.output, "Output file was not created")
+        content = result.output
+        self.assertIn(b"LOAD", content)
+        self.assertIn(b"STORE", content)
     
     def test_memory_mapping_disabled(self):
         """Test compilation with memory mapping disabled"""
@@ -112,10 +85,8 @@ class MemoryMapperTest(unittest.TestCase):
         # TODO: Add an option to disable memory mapping in the compiler
         # This is a placeholder test for now
         
-        # Create a test C++ file
-        test_file = os.path.join(self.temp_dir.name, "test_memory_disabled.cpp")
-        with open(test_file, "w") as f:
-            f.write("""
+        # Test C++ source
+        source = b"""
             void matrixMultiply(int A[][2], int B[][2], int C[][2]) {
                 for (int i = 0; i < 2; i++) {
                     for (int j = 0; j < 2; j++) {
@@ -126,22 +97,18 @@ class MemoryMapperTest(unittest.TestCase):
                     }
                 }
             }
-            """)
+            """
         
         # Run the compiler with memory mapping (since we can't disable it yet)
-        output_file = os.path.join(self.temp_dir.name, "output.txt")
-        result = subprocess.run(
-            [self.compiler_path, "-v", "-o", output_file, test_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_compiler(COMPILER, ["-v"], source, self.temp_dir.name)
         
         # Check if compilation was successful
-        self.assertEqual(result.returncode, 0, 
-                         f"Memory mapper test failed with return code {result.returncode}. Error: {result.stderr}")
+        if result.returncode != 0:
+            err = result.stderr.decode("utf-8", "replace")
+            self.fail(f"Memory mapper test failed with return code {result.returncode}. Error: {err}")
         
         # Check for memory mapping logs
-        self.assertIn("memory mapping", result.stdout.lower())
+        self.assertIn(b"memory mapping", result.stdout.lower())
 
 if __name__ == "__main__":
     unittest.main()
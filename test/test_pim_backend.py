@@ -3,37 +3,27 @@
 Test script for the PIM Backend component of the PIM compiler
 """
 
+import json
 import os
 import sys
 import subprocess
-import tempfile
 import unittest
 import re
+from pathlib import Path
 
-class PIMBackendTest(unittest.TestCase):
-    
-    def setUp(self):
-        # Path to the compiler executable
-        self.compiler_path = os.path.join("..", "build", "pim_compiler")
-        
-        # Check if the compiler exists
-        if not os.path.exists(self.compiler_path):
-            self.skipTest("Compiler executable not found. Build the project first.")
-        
-        # Create a temporary directory for test files
-        self.temp_dir = tempfile.TemporaryDirectory()
-    
-    def tearDown(self):
-        # Clean up the temporary directory
-        self.temp_dir.cleanup()
+from _compile_cache import run_compiler
+from _test_env import COMPILER, CompilerTestMixin
+
+# Non-NOP instruction line: OPCODE DEST, SRC1, SRC2 ; 0xHEXVALUE
+_INSN_RE = re.compile(rb"^(?!NOP)\S[^;\n]* ; 0x[0-9a-fA-F]{8}[^;\n]*$", re.MULTILINE)
+
+class PIMBackendTest(CompilerTestMixin, unittest.TestCase):
     
     def test_pim_instruction_generation(self):
         """Test generation of PIM instructions for matrix multiplication"""
         
-        # Create a test C++ file
-        test_file = os.path.join(self.temp_dir.name, "test_pim_gen.cpp")
-        with open(test_file, "w") as f:
-            f.write("""
+        # Test C++ source
+        source = b"""
             void matrixMultiply(int A[][10], int B[][10], int C[][10], int m, int n, int p) {
                 for (int i = 0; i < m; i++) {
                     for (int j = 0; j < p; j++) {
@@ -44,45 +34,38 @@ class PIMBackendTest(unittest.TestCase):
                     }
                 }
             }
-            """)
+            """
         
         # Run the compiler to generate PIM instructions
-        output_file = os.path.join(self.temp_dir.name, "output.txt")
-        result = subprocess.run(
-            [self.compiler_path, "-v", "-o", output_file, test_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_compiler(COMPILER, [], source, self.temp_dir.name)
         
         # Check if instruction generation was successful
-        self.assertEqual(result.returncode, 0, 
-                         f"PIM backend test failed with return code {result.returncode}. Error: {result.stderr}")
+        if result.returncode != 0:
+            err = result.stderr.decode("utf-8", "replace")
+            self.fail(f"PIM backend test failed with return code {result.returncode}. Error: {err}")
         
         # Check that the output file exists and contains PIM instructions
-        self.assertTrue(os.path.exists(output_file), "Output file was not created")
-        
-        with open(output_file, "r") as f:
-            content = f.read()
-            
-            # Check for expected instruction types
-            self.assertIn("CONFIG", content)
-            self.assertIn("LOAD", content)
-            self.assertIn("MOVE", content)
-            self.assertIn("MUL", content)
-            self.assertIn("ADD", content)
-            self.assertIn("STORE", content)
-            
-            # Count instructions
-            instruction_count = len(content.strip().split("\n"))
-            self.assertGreater(instruction_count, 10, "Too few instructions generated")
+        self.assertIsNotNone(result.output, "Output file was not created")
+        
+        content = result.output
+        
+        # Check for expected instruction types
+        self.assertIn(b"CONFIG", content)
+        self.assertIn(b"LOAD", content)
+        self.assertIn(b"MOVE", content)
+        self.assertIn(b"MUL", content)
+        self.assertIn(b"ADD", content)
+        self.assertIn(b"STORE", content)
+        
+        # Count instructions
+        instruction_count = len(content.strip().split(b"\n"))
+        self.assertGreater(instruction_count, 10, "Too few instructions generated")
     
     def test_pim_instruction_format(self):
         """Test the format of generated PIM instructions"""
         
-        # Create a test C++ file
-        test_file = os.path.join(self.temp_dir.name, "test_pim_format.cpp")
-        with open(test_file, "w") as f:
-            f.write("""
+        # Test C++ source
+        source = b"""
             void matrixMultiply(int A[][2], int B[][2], int C[][2]) {
                 for (int i = 0; i < 2; i++) {
                     for (int j = 0; j < 2; j++) {
@@ -93,79 +76,109 @@ class PIMBackendTest(unittest.TestCase):
                     }
                 }
             }
-            """)
+            """
         
         # Run the compiler to generate PIM instructions
-        output_file = os.path.join(self.temp_dir.name, "output.txt")
-        result = subprocess.run(
-            [self.compiler_path, "-v", "-o", output_file, test_file],
-            capture_output=True,
-            text=True
-        )
+        result = run_compiler(COMPILER, [], source, self.temp_dir.name)
         
         # Check if instruction generation was successful
-        self.assertEqual(result.returncode, 0, 
-                         f"PIM backend test failed with return code {result.returncode}. Error: {result.stderr}")
+        if result.returncode != 0:
+            err = result.stderr.decode("utf-8", "replace")
+            self.fail(f"PIM backend test failed with return code {result.returncode}. Error: {err}")
         
         # Check the format of instructions
-        with open(output_file, "r") as f:
-            content = f.read()
-            lines = content.strip().split("\n")
-            
-            for line in lines:
-                # Check the instruction format - should match our ISA format
-                # Most instructions should have format: OPCODE DEST, SRC1, SRC2 ; 0xHEXVALUE
-                if not line.startswith("NOP"):  # NOP has no operands
-                    parts = line.split(" ; ")
-                    self.assertEqual(len(parts), 2, f"Instruction missing binary representation: {line}")
-                    
-                    # Check binary representation format
-                    binary_part = parts[1]
-                    self.assertTrue(binary_part.startswith("0x"), 
-                                   f"Binary representation doesn't start with 0x: {binary_part}")
-                    self.assertTrue(re.match(r"0x[0-9a-fA-F]{8}", binary_part), 
-                                   f"Binary representation not in 32-bit hex format: {binary_part}")
+        # Every instruction except NOP (which has no operands) should match
+        # our ISA format, including a 32-bit hex binary representation
+        self.assertIsNotNone(result.output, "Output file was not created")
+        content = result.output.strip()
+        non_nop_lines = [line for line in content.split(b"\n") if not line.startswith(b"NOP")]
+        matches = _INSN_RE.findall(content)
+        
+        if len(matches) != len(non_nop_lines):
+            bad_lines = [line.decode() for line in non_nop_lines if not _INSN_RE.match(line)]
+            self.fail(f"Instructions not in 'OPCODE operands ; 0xHHHHHHHH' format: {bad_lines}")
     
     def test_matrix_size_handling(self):
         """Test handling of different matrix sizes"""
         
-        # Create test files with different matrix sizes
+        # Different matrix sizes, all compiled by one batch-mode compiler process
         sizes = [(2, 2, 2), (3, 4, 2), (10, 10, 10)]
         
-        for size in sizes:
-            rows, common, cols = size
-            
-            # Create a test C++ file
-            test_file = os.path.join(self.temp_dir.name, f"test_size_{rows}_{common}_{cols}.cpp")
-            with open(test_file, "w") as f:
-                f.write(f"""
-                void matrixMultiply(int* A, int* B, int* C) {{
-                    // Matrix A: {rows}x{common}, Matrix B: {common}x{cols}, Matrix C: {rows}x{cols}
-                    for (int i = 0; i < {rows}; i++) {{
-                        for (int j = 0; j < {cols}; j++) {{
-                            C[i * {cols} + j] = 0;
-                            for (int k = 0; k < {common}; k++) {{
-                                C[i * {cols} + j] += A[i * {common} + k] * B[k * {cols} + j];
-                            }}
+        jobs = []
+        for rows, common, cols in sizes:
+            # Test C++ source
+            test_file = Path(self.temp_dir.name, f"test_size_{rows}_{common}_{cols}.cpp")
+            test_file.write_bytes(f"""
+            void matrixMultiply(int* A, int* B, int* C) {{
+                // Matrix A: {rows}x{common}, Matrix B: {common}x{cols}, Matrix C: {rows}x{cols}
+                for (int i = 0; i < {rows}; i++) {{
+                    for (int j = 0; j < {cols}; j++) {{
+                        C[i * {cols} + j] = 0;
+                        for (int k = 0; k < {common}; k++) {{
+                            C[i * {cols} + j] += A[i * {common} + k] * B[k * {cols} + j];
                         }}
                     }}
                 }}
-                """)
-            
-            # Run the compiler to generate PIM instructions
-            output_file = os.path.join(self.temp_dir.name, f"output_{rows}_{common}_{cols}.txt")
-            result = subprocess.run(
-                [self.compiler_path, "-v", "-o", output_file, test_file],
-                capture_output=True,
-                text=True
-            )
-            
-            # Check if instruction generation was successful
-            self.assertEqual(result.returncode, 0, 
-                            f"PIM backend test for size {size} failed with return code {result.returncode}. Error: {result.stderr}")
-            
-            # Check that the output file exists
-            self.assertTrue(os.path.exists(output_file), f"Output file for size {size} was not created")
+            }}
+            """.encode())
+            output_file = test_file.with_suffix(".txt")
+            jobs.append({"src": str(test_file), "out": str(output_file)})
+        
+        # Run the compiler once, feeding one job per line on stdin
+        proc = self._run_batch(json.dumps(job) for job in jobs)
+        results = [json.loads(line) for line in proc.stdout.splitlines()]
+        self.assertEqual(len(results), len(sizes), "Batch mode did not report one result per job")
+        
+        for size, job, result in zip(sizes, jobs, results):
+            with self.subTest(size=size):
+                # Check if instruction generation was successful
+                self.assertEqual(result["returncode"], 0,
+                                 f"PIM backend test for size {size} failed with return code {result['returncode']}. "
+                                 f"Error: {result.get('stderr', '')}")
+                
+                # Check that the output file exists
+                self.assertTrue(os.path.exists(job["out"]), f"Output file for size {size} was not created")
+        
+        self.assertEqual(proc.returncode, 0, "Batch mode reported failure although every job succeeded")
+    
+    def test_batch_mode_errors(self):
+        """Test that malformed batch jobs are reported without stopping the batch"""
+        
+        source_file = Path(self.temp_dir.name, "test_batch_errors.cpp")
+        source_file.write_bytes(b"""
+        void matrixMultiply(int* A, int* B, int* C) {
+            C[0] = A[0] * B[0];
+        }
+        """)
+        output_file = str(source_file.with_suffix(".txt"))
+        
+        # One malformed job per line
+        lines = [
+            "{not json",
+            json.dumps({"out": output_file}),
+            json.dumps({"src": str(source_file)}),
+            json.dumps({"src": str(source_file), "out": output_file, "flags": "-v"}),
+            json.dumps({"src": str(source_file), "out": output_file, "flags": [1]}),
+            json.dumps({"src": str(source_file), "out": output_file, "flags": ["--batch"]}),
+        ]
+        proc = self._run_batch(lines)
+        results = [json.loads(line) for line in proc.stdout.splitlines()]
+        self.assertEqual(len(results), len(lines), "Batch mode did not report one result per job")
+        
+        for line, result in zip(lines, results):
+            with self.subTest(job=line):
+                self.assertEqual(result["returncode"], 1)
+                self.assertTrue(result["stderr"].startswith("Error:"),
+                                f"Unexpected error message: {result['stderr']!r}")
+        
+        self.assertEqual(proc.returncode, 1, "Batch mode did not report failure for malformed jobs")
+        self.assertFalse(os.path.exists(output_file), "Malformed job produced an output file")
+    
+    def _run_batch(self, lines):
+        """Run the compiler in batch mode on the given job lines"""
+        return subprocess.run([COMPILER, "--batch"],
+                              input="".join(line + "\n" for line in lines).encode(),
+                              stdout=subprocess.PIPE, cwd=self.temp_dir.name, timeout=60)
 
 if __name__ == "__main__":
     unittest.main()